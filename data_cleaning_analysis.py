@@ -9,7 +9,8 @@ nettoie et prépare les données en effectuant :
     - Ajout de colonnes calculées pertinentes
     - Normalisation des catégories (textes et colonnes catégorielles)
     - Traduction des catégories en français
-Les données nettoyées sont ensuite sauvegardées dans un nouveau fichier CSV dans le dossier 'output'.
+Les données nettoyées sont ensuite sauvegardées dans un nouveau fichier CSV dans le dossier 'output',
+ainsi qu'aux formats Parquet et Feather (lus en priorité par le script de visualisation).
 """
 
 import os
@@ -17,12 +18,110 @@ import pandas as pd
 import numpy as np
 import unicodedata
 
-def load_data(filename=None):
-    """Charge les données à partir du fichier CSV situé dans le dossier 'output'."""
+# pyarrow est optionnel : s'il est installé, il sert à lire et écrire les CSV (C++ multithread),
+# sinon on se rabat sur les moteurs de pandas
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    import pyarrow.ipc
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    pa = None
+    CSV_ENGINE = 'c'
+
+# Nombre de lignes traitées à la fois lors de la lecture du CSV brut
+CHUNK_SIZE = 100_000
+
+# Correspondances catégorie brute -> catégorie normalisée / traduite, complétées par map_categories
+RAW_TO_NORMALIZED = {}
+RAW_TO_FR = {}
+
+# Catégorisation du prix : Low (<=20), Medium (20-50], High (>50)
+PRICE_BINS = np.array([20.0, 50.0])
+PRICE_CATEGORIES = ['Low', 'Medium', 'High']
+
+# Plus grande note comptée avec np.bincount (au-delà, rating_price_sums utilise un groupby)
+MAX_BINCOUNT_RATING = 255
+
+# Colonnes lues dans le CSV brut et leurs types (évite l'inférence de types par pandas).
+# price et rating sont lus comme du texte : un prix du type '£51.77' ou une note non numérique
+# ne fait pas échouer la lecture, clean_data les convertit (valeurs invalides -> 0).
+RAW_DTYPES = {
+    'title': 'string',
+    'price': 'string',
+    'rating': 'string',
+    'product_link': 'string',
+    'category': 'string',
+}
+
+# Traduction des catégories (normalisées) de l'anglais vers le français
+TRANSLATIONS = {
+    "books": "Livres",
+    "travel": "Voyage",
+    "mystery": "Mystère",
+    "historical fiction": "Fiction Historique",
+    "sequential art": "Art Séquentiel",
+    "classics": "Classiques",
+    "philosophy": "Philosophie",
+    "romance": "Romance",
+    "womens fiction": "Fiction Féminine",
+    "fiction": "Fiction",
+    "childrens": "Pour Enfants",
+    "religion": "Religion",
+    "nonfiction": "Non-fiction",
+    "music": "Musique",
+    "default": "Défaut",
+    "science fiction": "Science-fiction",
+    "sports and games": "Sports et Jeux",
+    "add a comment": "Ajouter un commentaire",
+    "fantasy": "Fantaisie",
+    "new adult": "Nouveaux Adultes",
+    "young adult": "Jeunes Adultes",
+    "science": "Science",
+    "poetry": "Poésie",
+    "paranormal": "Paranormal",
+    "art": "Art",
+    "psychology": "Psychologie",
+    "autobiography": "Autobiographie",
+    "parenting": "Parentalité",
+    "adult fiction": "Fiction pour adultes",
+    "humor": "Humour",
+    "horror": "Horreur",
+    "history": "Histoire",
+    "food and drink": "Cuisine et Boissons",
+    "christian fiction": "Fiction Chrétienne",
+    "business": "Affaires",
+    "biography": "Biographie",
+    "thriller": "Thriller",
+    "contemporary": "Contemporain",
+    "spirituality": "Spiritualité",
+    "academic": "Académique",
+    "self help": "Développement Personnel",
+    "historical": "Historique",
+    "christian": "Chrétien",
+    "suspense": "Suspense",
+    "short stories": "Nouvelles",
+    "novels": "Romans",
+    "health": "Santé",
+    "politics": "Politique",
+    "cultural": "Culturel",
+    "erotica": "Érotisme",
+    "crime": "Crime"
+}
+
+def load_data(filename=None, chunksize=None):
+    """
+    Charge les données à partir du fichier CSV situé dans le dossier 'output'.
+    Si chunksize est renseigné, retourne un itérateur de DataFrames de chunksize lignes
+    (le moteur pyarrow ne gérant pas la lecture par blocs, le moteur C est alors utilisé).
+    """
     if filename is None:
         filename = os.path.join("output", "books.csv")
     try:
-        df = pd.read_csv(filename, encoding='utf-8')
+        df = pd.read_csv(filename, encoding='utf-8', usecols=list(RAW_DTYPES),
+                         dtype=RAW_DTYPES, engine='c' if chunksize else CSV_ENGINE,
+                         chunksize=chunksize)
         print("Données chargées avec succès depuis", filename)
         return df
     except Exception as e:
@@ -30,7 +129,10 @@ def load_data(filename=None):
         return None
 
 def normalize_text(text):
-    """Normalise le texte : supprime les accents et convertit en minuscules."""
+    """
+    Normalise le texte : supprime les accents et convertit en minuscules.
+    Version scalaire ; pour une colonne entière, utiliser normalize_series.
+    """
     if isinstance(text, str):
         # Supprimer les accents
         text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
@@ -38,66 +140,54 @@ def normalize_text(text):
         return text.lower().strip()
     return text
 
+def normalize_series(series):
+    """
+    Version vectorisée de normalize_text pour une Series pandas.
+    Chaque étape passe par l'accesseur .str (les valeurs manquantes sont conservées).
+    """
+    return (series.str.normalize('NFKD')
+                  .str.encode('ascii', errors='ignore')
+                  .str.decode('utf-8')
+                  .str.lower()
+                  .str.strip())
+
 def translate_category(cat):
     """
     Traduit la catégorie en anglais en français.
     Si la catégorie n'est pas dans le dictionnaire, elle est retournée telle quelle.
     """
-    translations = {
-        "books": "Livres",
-        "travel": "Voyage",
-        "mystery": "Mystère",
-        "historical fiction": "Fiction Historique",
-        "sequential art": "Art Séquentiel",
-        "classics": "Classiques",
-        "philosophy": "Philosophie",
-        "romance": "Romance",
-        "womens fiction": "Fiction Féminine",
-        "fiction": "Fiction",
-        "childrens": "Pour Enfants",
-        "religion": "Religion",
-        "nonfiction": "Non-fiction",
-        "music": "Musique",
-        "default": "Défaut",
-        "science fiction": "Science-fiction",
-        "sports and games": "Sports et Jeux",
-        "add a comment": "Ajouter un commentaire",
-        "fantasy": "Fantaisie",
-        "new adult": "Nouveaux Adultes",
-        "young adult": "Jeunes Adultes",
-        "science": "Science",
-        "poetry": "Poésie",
-        "paranormal": "Paranormal",
-        "art": "Art",
-        "psychology": "Psychologie",
-        "autobiography": "Autobiographie",
-        "parenting": "Parentalité",
-        "adult fiction": "Fiction pour adultes",
-        "humor": "Humour",
-        "horror": "Horreur",
-        "history": "Histoire",
-        "food and drink": "Cuisine et Boissons",
-        "christian fiction": "Fiction Chrétienne",
-        "business": "Affaires",
-        "biography": "Biographie",
-        "thriller": "Thriller",
-        "contemporary": "Contemporain",
-        "spirituality": "Spiritualité",
-        "academic": "Académique",
-        "self help": "Développement Personnel",
-        "historical": "Historique",
-        "christian": "Chrétien",
-        "suspense": "Suspense",
-        "short stories": "Nouvelles",
-        "novels": "Romans",
-        "health": "Santé",
-        "politics": "Politique",
-        "cultural": "Culturel",
-        "erotica": "Érotisme",
-        "crime": "Crime"
-    }
     cat_norm = cat.lower().strip()
-    return translations.get(cat_norm, cat)
+    return TRANSLATIONS.get(cat_norm, cat)
+
+def map_categories(categories):
+    """
+    Retourne les catégories normalisées et traduites en français pour une Series de catégories brutes.
+    Chaque valeur distincte n'est normalisée et traduite qu'une seule fois : le résultat est conservé
+    dans RAW_TO_NORMALIZED et RAW_TO_FR (y compris d'un bloc de données à l'autre),
+    puis propagé à toutes les lignes par une simple recherche dans un dictionnaire.
+    """
+    for raw in categories.unique():
+        if raw not in RAW_TO_FR:
+            normalized = normalize_text(raw)
+            RAW_TO_NORMALIZED[raw] = normalized
+            RAW_TO_FR[raw] = TRANSLATIONS.get(normalized, normalized)
+    return categories.map(RAW_TO_NORMALIZED), categories.map(RAW_TO_FR)
+
+def clean_numeric(price, rating):
+    """
+    Nettoie les tableaux NumPy price (float64) et rating (float32), modifiés sur place :
+    les valeurs manquantes sont remplacées par 0, puis on calcule les codes de catégorie
+    de prix par recherche dichotomique dans PRICE_BINS (side='left' : intervalles fermés
+    à droite, comme pd.cut) et les notes entières. Les notes restent en int64 : rien ne borne
+    la valeur lue dans le CSV brut et un int8 ferait boucler silencieusement une note >= 128.
+    Le prix reste en float64 : en float32, 51.77 deviendrait 51.77000045776367 dans les fichiers
+    Parquet et Feather lus par la visualisation.
+    Retourne (price, codes de catégorie de prix en int8, rating en int64).
+    """
+    np.nan_to_num(price, copy=False)
+    np.nan_to_num(rating, copy=False)
+    price_codes = np.searchsorted(PRICE_BINS, price, side='left').astype(np.int8)
+    return price, price_codes, rating.astype(np.int64)
 
 def clean_data(df):
     """Nettoyage et préparation des données."""
@@ -108,36 +198,32 @@ def clean_data(df):
     print("\nValeurs manquantes par colonne AVANT nettoyage:")
     print(df.isnull().sum())
 
-    # Gestion des valeurs manquantes
+    # Gestion des valeurs manquantes (price et rating sont traités par clean_numeric)
     df['title'] = df['title'].fillna("inconnu")
-    df['price'] = df['price'].fillna(0)
-    df['rating'] = df['rating'].fillna(0)
     df['product_link'] = df['product_link'].fillna("inconnu")
     df['category'] = df['category'].fillna("inconnu")
 
     # Conversion des types de données
-    # Conversion du prix en nombre (float) : suppression éventuelle du symbole '£'
-    if df['price'].dtype == object:
-        df['price'] = df['price'].replace({'£': ''}, regex=True)
-    df['price'] = pd.to_numeric(df['price'], errors='coerce').fillna(0)
-
-    # Conversion du rating en entier puis en catégorie
-    df['rating'] = pd.to_numeric(df['rating'], errors='coerce').fillna(0).astype(int)
+    # Suppression éventuelle du symbole '£' en préfixe du prix
+    if not pd.api.types.is_numeric_dtype(df['price']):
+        df['price'] = df['price'].str.lstrip('£')
+    # Prix (float64), codes de catégorie de prix (int8) et rating (int64) calculés en une seule passe
+    price, price_codes, rating = clean_numeric(
+        pd.to_numeric(df['price'], errors='coerce').to_numpy(dtype=np.float64, copy=True),
+        pd.to_numeric(df['rating'], errors='coerce').to_numpy(dtype=np.float32, copy=True),
+    )
+    df['price'] = price
+    df['rating'] = rating
 
     # Normalisation du texte pour la colonne title et la colonne category
-    df['title_normalized'] = df['title'].apply(normalize_text)
-    df['category_normalized'] = df['category'].apply(normalize_text)
-
-    # Traduction des catégories en français et création d'une nouvelle colonne
-    df['category_fr'] = df['category_normalized'].apply(translate_category)
+    df['title_normalized'] = normalize_series(df['title'])
+    # Normalisation et traduction en français en une seule recherche par ligne
+    df['category_normalized'], df['category_fr'] = map_categories(df['category'])
 
     # Ajout d'une colonne calculée : catégorisation du prix
-    # Exemple de catégorisation : Low (<20), Medium (20-50), High (>50)
-    categories_price = ['Low', 'Medium', 'High']
-    df['price_category'] = pd.cut(df['price'], bins=[-np.inf, 20, 50, np.inf], labels=categories_price)
+    df['price_category'] = pd.Categorical.from_codes(price_codes, categories=PRICE_CATEGORIES, ordered=True)
 
     # Normalisation des colonnes catégorielles : conversion en type "category"
-    df['price_category'] = df['price_category'].astype('category')
     df['rating'] = df['rating'].astype('category')
     df['category'] = df['category_normalized'].astype('category')
     df['category_fr'] = df['category_fr'].astype('category')
@@ -159,7 +245,8 @@ def analyze_data(df):
 
     # Prix moyen par rating (attention : rating est une catégorie, on le convertit en int pour le calcul)
     df['rating_int'] = df['rating'].astype(int)
-    avg_price_rating = df.groupby('rating_int')['price'].mean()
+    counts, sums = rating_price_sums(df)
+    avg_price_rating = (sums / counts).rename('price')
     print("\nPrix moyen par rating:")
     print(avg_price_rating)
 
@@ -177,28 +264,207 @@ def analyze_data(df):
     print("\nNombre de livres par catégorie (en français):")
     print(category_fr_counts)
 
-def save_clean_data(df, filename=None):
-    """Sauvegarde les données nettoyées dans un fichier CSV situé dans le dossier 'output'."""
+def rating_price_sums(df):
+    """
+    Retourne deux Series indexées par la note (notes présentes uniquement) : le nombre de livres
+    et la somme des prix pour chaque rating. Les notes attendues (0 à 5) sont comptées avec
+    np.bincount ; une note négative ou supérieure à MAX_BINCOUNT_RATING (données corrompues)
+    fait basculer sur un groupby, np.bincount refusant les valeurs négatives et allouant
+    un tableau de la taille de la plus grande note.
+    """
+    ratings = df['rating'].to_numpy(dtype=np.int64)
+    prices = df['price'].to_numpy(dtype=np.float64)
+    if ratings.size and (ratings.min() < 0 or ratings.max() > MAX_BINCOUNT_RATING):
+        grouped = pd.Series(prices).groupby(ratings)
+        counts, sums = grouped.size(), grouped.sum()
+    else:
+        counts = np.bincount(ratings)
+        sums = np.bincount(ratings, weights=prices, minlength=counts.size)
+        present = np.flatnonzero(counts)
+        counts = pd.Series(counts[present], index=present)
+        sums = pd.Series(sums[present], index=present)
+    return counts.rename_axis('rating_int'), sums.rename_axis('rating_int')
+
+def _add_counts(total, counts):
+    """Additionne deux séries d'effectifs (ou de sommes) en alignant leurs index."""
+    counts = counts.set_axis(counts.index.astype(object))
+    if total is None:
+        return counts
+    return total.add(counts, fill_value=0)
+
+def update_stats(df, stats=None):
+    """
+    Met à jour les agrégats (effectifs et sommes) utilisés par l'analyse
+    avec un bloc de données nettoyées. Retourne le dictionnaire d'agrégats.
+    """
+    if stats is None:
+        stats = dict.fromkeys(['rating_counts', 'price_sum_rating', 'price_category_counts',
+                               'category_counts', 'category_fr_counts'])
+    df['rating_int'] = df['rating'].astype(int)
+    counts, sums = rating_price_sums(df)
+    stats['rating_counts'] = _add_counts(stats['rating_counts'], counts)
+    stats['price_sum_rating'] = _add_counts(stats['price_sum_rating'], sums)
+    stats['price_category_counts'] = _add_counts(stats['price_category_counts'],
+                                                 df['price_category'].value_counts())
+    stats['category_counts'] = _add_counts(stats['category_counts'], df['category'].value_counts())
+    stats['category_fr_counts'] = _add_counts(stats['category_fr_counts'],
+                                              df['category_fr'].value_counts())
+    return stats
+
+def print_stats(stats):
+    """Affiche les analyses descriptives à partir des agrégats cumulés sur tous les blocs."""
+    counts = stats['rating_counts'].astype(int).sort_index()
+    print("\nNombre de livres par rating:")
+    print(counts.rename('count'))
+
+    print("\nPrix moyen par rating:")
+    print((stats['price_sum_rating'] / counts).rename('price'))
+
+    print("\nNombre de livres par catégorie de prix:")
+    print(stats['price_category_counts'].astype(int).sort_values(ascending=False))
+
+    print("\nNombre de livres par catégorie:")
+    print(stats['category_counts'].astype(int).sort_values(ascending=False))
+
+    print("\nNombre de livres par catégorie (en français):")
+    print(stats['category_fr_counts'].astype(int).sort_values(ascending=False))
+
+def save_clean_data(df, filename=None, mode='w', header=True):
+    """
+    Sauvegarde les données nettoyées dans un fichier CSV situé dans le dossier 'output'.
+    Avec mode='a' et header=False, le bloc est ajouté à la suite du fichier existant.
+    Les erreurs d'écriture sont propagées : main arrête alors le traitement et supprime
+    les fichiers incomplets.
+    """
     if filename is None:
         filename = os.path.join("output", "books_clean.csv")
     # Création du dossier de sortie s'il n'existe pas
     output_dir = os.path.dirname(filename)
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
+    if pa is not None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        options = pa_csv.WriteOptions(include_header=header)
+        with open(filename, mode + 'b') as f:
+            pa_csv.write_csv(table, f, write_options=options)
+    else:
+        df.to_csv(filename, index=False, encoding='utf-8', mode=mode, header=header)
+    print(f"\nLes données nettoyées ont été sauvegardées dans {filename}")
+
+def save_clean_parquet(df, writer=None, filename=None):
+    """
+    Ajoute un bloc de données nettoyées au fichier Parquet (compression zstd) situé dans
+    le dossier 'output'. Le format colonne conserve les types catégoriels et évite à la
+    visualisation de reparser du texte. Retourne le ParquetWriter à réutiliser pour les
+    blocs suivants (à fermer par l'appelant), ou None si pyarrow n'est pas installé.
+    Comme pour save_clean_data, les erreurs d'écriture sont propagées à main.
+    """
+    if pa is None:
+        return None
+    if filename is None:
+        filename = os.path.join("output", "books_clean.parquet")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if writer is None:
+        writer = pq.ParquetWriter(filename, table.schema, compression='zstd')
+    else:
+        table = table.cast(writer.schema)
+    writer.write_table(table)
+    return writer
+
+def _unify_dictionaries(batch, schema, dictionaries):
+    """
+    Réécrit les colonnes catégorielles d'un bloc sur des dictionnaires cumulés (un par colonne,
+    dans dictionaries) : les valeurs jamais vues sont ajoutées en fin de dictionnaire, si bien que
+    chaque bloc n'ajoute qu'un delta au dictionnaire des blocs précédents.
+    """
+    columns = []
+    for field, column in zip(schema, batch.columns):
+        if pa.types.is_dictionary(field.type):
+            known = dictionaries.setdefault(field.name, {})
+            codes = [known.setdefault(value, len(known)) for value in column.dictionary.to_pylist()]
+            indices = pa.array(codes, type=field.type.index_type).take(column.indices)
+            column = pa.DictionaryArray.from_arrays(
+                indices, pa.array(list(known), type=field.type.value_type), ordered=field.type.ordered)
+        columns.append(column)
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+def save_clean_feather(parquet_file=None, filename=None):
+    """
+    Convertit le fichier Parquet des données nettoyées en fichier Feather non compressé,
+    que le script de visualisation peut projeter en mémoire et charger quasi instantanément.
+    La conversion se fait bloc par bloc (mémoire bornée) : le format Feather n'acceptant qu'un
+    dictionnaire par colonne catégorielle, complété par des deltas, les dictionnaires des
+    différents blocs sont unifiés au fil de l'écriture (index en int32 pour ne pas déborder).
+    """
+    if pa is None:
+        return
+    if parquet_file is None:
+        parquet_file = os.path.join("output", "books_clean.parquet")
+    if filename is None:
+        filename = os.path.join("output", "books_clean.feather")
     try:
-        df.to_csv(filename, index=False, encoding='utf-8')
-        print(f"\nLes données nettoyées ont été sauvegardées dans {filename}")
+        source = pq.ParquetFile(parquet_file)
+        schema = pa.schema(
+            [field.with_type(pa.dictionary(pa.int32(), field.type.value_type, field.type.ordered))
+             if pa.types.is_dictionary(field.type) else field for field in source.schema_arrow],
+            metadata=source.schema_arrow.metadata)
+        options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        dictionaries = {}
+        with pa.ipc.new_file(filename, schema, options=options) as writer:
+            for batch in source.iter_batches():
+                writer.write_batch(_unify_dictionaries(batch, schema, dictionaries))
+        print("Les données nettoyées ont également été sauvegardées au format Feather.")
     except Exception as e:
-        print("Erreur lors de la sauvegarde des données :", e)
+        print("Erreur lors de la sauvegarde des données en Feather :", e)
 
-def main():
-    df = load_data()
-    if df is None:
-        return
+def remove_partial_outputs():
+    """Supprime les fichiers nettoyés (CSV et Parquet) écrits en partie avant une erreur."""
+    for name in ("books_clean.csv", "books_clean.parquet"):
+        filename = os.path.join("output", name)
+        if os.path.exists(filename):
+            os.remove(filename)
+            print("Fichier incomplet supprimé :", filename)
+
+def main(chunksize=CHUNK_SIZE):
+    """
+    Nettoie le CSV brut bloc par bloc, sauvegarde les données nettoyées et affiche les analyses.
+    Retourne True si les données nettoyées ont été entièrement écrites.
+    """
+    # Lecture par blocs : la mémoire utilisée reste bornée quelle que soit la taille du CSV
+    chunks = load_data(chunksize=chunksize)
+    if chunks is None:
+        return False
+
+    stats = None
+    parquet_writer = None
+    completed = False
+    # Les blocs sont lus (et analysés par pandas) au fil de l'itération : une erreur de lecture,
+    # de nettoyage ou d'écriture peut survenir à n'importe quel bloc, après l'écriture des précédents
+    try:
+        for i, chunk in enumerate(chunks):
+            chunk_clean = clean_data(chunk)
+            stats = update_stats(chunk_clean, stats)
+            save_clean_data(chunk_clean, mode='w' if i == 0 else 'a', header=(i == 0))
+            parquet_writer = save_clean_parquet(chunk_clean, parquet_writer)
+        completed = True
+    except Exception as e:
+        print("Erreur lors du nettoyage ou de la sauvegarde des données :", e)
+    finally:
+        chunks.close()
+        if parquet_writer is not None:
+            parquet_writer.close()
 
-    df_clean = clean_data(df)
-    analyze_data(df_clean)
-    save_clean_data(df_clean)
+    if not completed:
+        # Ne pas laisser de fichiers nettoyés incomplets (ils passeraient pour à jour)
+        if stats is not None:
+            remove_partial_outputs()
+        return False
+    if parquet_writer is not None:
+        print("Les données nettoyées ont également été sauvegardées au format Parquet.")
+        save_clean_feather()
+    if stats is not None:
+        print_stats(stats)
+    return True
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
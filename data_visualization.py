@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 """
 Script de visualisation pour Books to Scrape utilisant Seaborn.
-Ce script charge les données nettoyées depuis le fichier CSV (situé dans le dossier 'output')
+Ce script charge les données nettoyées depuis le fichier Feather, Parquet ou CSV (situé dans le dossier 'output')
 et génère plusieurs graphiques permettant d'analyser la répartition des livres :
     - Distribution des livres par rating
     - Distribution des livres par catégorie de prix
@@ -14,263 +14,413 @@ et génère plusieurs graphiques permettant d'analyser la répartition des livre
     - Violin plot des prix par rating
     - Boxplot des prix pour le top 10 des catégories (anglais et français)
 Les graphiques sont affichés et sauvegardés sous forme d'images PNG dans le dossier 'images'
-avec une résolution de 300 dpi.
+avec une résolution de 300 dpi. Avec BOOKS_ETL_BATCH=1, ils sont seulement sauvegardés.
 """
 
 import os
+import concurrent.futures
+import numpy as np
 import pandas as pd
+import matplotlib
+
+# Mode batch (variable d'environnement BOOKS_ETL_BATCH=1, ex. serveur sans écran) :
+# backend non interactif Agg et aucun affichage, les graphiques sont uniquement sauvegardés
+BATCH_MODE = os.environ.get("BOOKS_ETL_BATCH") == "1"
+if BATCH_MODE:
+    matplotlib.use('Agg')
+# Backend à restaurer quand le mode batch est désactivé par set_batch_mode
+_interactive_backend = None
+
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
 import seaborn as sns
 
+# pyarrow (optionnel) : lecture Feather/Parquet et moteur CSV multithread, sinon moteur C de pandas
+try:
+    import pyarrow.feather as feather
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    feather = None
+    CSV_ENGINE = 'c'
+
+# Seules les colonnes utilisées par les graphiques sont lues, avec des types explicites.
+# Les colonnes textuelles sont lues en type "category" (codes entiers, comme depuis Feather/Parquet) :
+# moins de mémoire et des value_counts / groupby plus rapides.
+CLEAN_DTYPES = {
+    'price': 'float64',
+    'rating': 'int64',
+    'price_category': pd.CategoricalDtype(['Low', 'Medium', 'High'], ordered=True),
+    'category': 'category',
+    'category_fr': 'category',
+}
+
+# Compression PNG minimale (zlib niveau 1) : encodage bien plus rapide, fichiers un peu plus gros
+PNG_SAVE_KWARGS = {'compress_level': 1}
+
+# Style commun à tous les graphiques (appliqué une seule fois au chargement du module)
+sns.set_style("whitegrid")
+
+# Graphiques par catégorie de livres, générés pour chaque langue :
+# (colonne, langue indiquée dans les titres, libellé de l'axe, suffixe du fichier image)
+CATEGORY_PLOT_SPECS = [
+    ('category', 'Anglais', 'Catégorie', 'en'),
+    ('category_fr', 'Français', 'Catégorie (FR)', 'fr'),
+]
+
+# Noms des images écrites par main() dans image_dir (les graphiques par catégorie, une fois par langue)
+IMAGE_FILES = [
+    "rating_distribution_seaborn.png",
+    "price_category_distribution_seaborn.png",
+    "price_histogram_seaborn.png",
+    "boxplot_price_by_rating_seaborn.png",
+    "violin_price_by_rating.png",
+] + [f"{name}_{spec[3]}.png"
+     for spec in CATEGORY_PLOT_SPECS
+     for name in ("top_categories_distribution", "category_pie_chart",
+                  "all_categories_distribution", "boxplot_price_by_category")]
+
+# Nombre de points de la grille sur laquelle la courbe KDE est estimée (par FFT),
+# comme la grille de 200 points de seaborn (gridsize)
+KDE_GRID_SIZE = 200
+# Jusqu'à ce nombre de valeurs, la densité est calculée exactement (coût N * KDE_GRID_SIZE),
+# au-delà elle est approchée par convolution FFT
+KDE_EXACT_MAX_VALUES = 10_000
+
 # Dossier de sortie pour les images
 image_dir = "images"
 if not os.path.exists(image_dir):
     os.makedirs(image_dir)
 
 def load_data(filename=None):
-    """Charge les données nettoyées depuis le fichier CSV situé dans le dossier 'output'."""
+    """
+    Charge les données nettoyées depuis le dossier 'output'.
+    Ordre de préférence (types conservés, lecture des seules colonnes utiles) : le fichier Feather
+    (projeté en mémoire, quasi instantané), puis le fichier Parquet, sinon le fichier CSV.
+    """
     if filename is None:
         filename = os.path.join("output", "books_clean.csv")
+        if feather is not None:
+            for candidate in ("books_clean.feather", "books_clean.parquet"):
+                if os.path.exists(os.path.join("output", candidate)):
+                    filename = os.path.join("output", candidate)
+                    break
     try:
-        df = pd.read_csv(filename, encoding='utf-8')
+        if filename.endswith(".feather"):
+            df = feather.read_table(filename, columns=list(CLEAN_DTYPES), memory_map=True).to_pandas()
+        elif filename.endswith(".parquet"):
+            df = pd.read_parquet(filename, columns=list(CLEAN_DTYPES))
+        else:
+            df = pd.read_csv(filename, encoding='utf-8', usecols=list(CLEAN_DTYPES),
+                             dtype=CLEAN_DTYPES, engine=CSV_ENGINE)
         print("Données chargées pour visualisation depuis", filename)
-        # Création de la colonne rating_int à partir de la colonne rating (convertie en int)
+        # Création de la colonne rating_int à partir de la colonne rating (entier 64 bits, comme
+        # à l'écriture : un int8 ferait boucler silencieusement une note >= 128)
         if 'rating' in df.columns:
-            df['rating_int'] = df['rating'].astype(int)
+            df['rating_int'] = df['rating'].astype('int64')
         return df
     except Exception as e:
         print("Erreur lors du chargement des données :", e)
         return None
 
+def set_batch_mode(enabled):
+    """
+    Active ou désactive le mode batch en cours d'exécution (équivalent de BOOKS_ETL_BATCH=1) :
+    backend Agg et aucun affichage. La variable d'environnement est aussi mise à jour pour que
+    les processus du pool de rendu démarrent dans le même mode. Retourne l'état précédent.
+    """
+    global BATCH_MODE, _interactive_backend
+    previous = BATCH_MODE
+    if enabled and not BATCH_MODE:
+        _interactive_backend = matplotlib.get_backend()
+        os.environ["BOOKS_ETL_BATCH"] = "1"
+        plt.switch_backend('Agg')
+    elif not enabled and BATCH_MODE:
+        os.environ.pop("BOOKS_ETL_BATCH", None)
+        if _interactive_backend is not None:
+            plt.switch_backend(_interactive_backend)
+    BATCH_MODE = enabled
+    return previous
+
+def _save_figure(fig, filename):
+    """
+    Ajuste la mise en page, sauvegarde la figure dans le dossier 'images' (300 dpi),
+    l'affiche (sauf en mode batch) puis la ferme pour libérer la mémoire.
+    """
+    fig.tight_layout()
+    fig.savefig(os.path.join(image_dir, filename), dpi=300, pil_kwargs=PNG_SAVE_KWARGS)
+    if not BATCH_MODE:
+        plt.show()
+    plt.close(fig)
+
+def _appearance_order(values):
+    """
+    Modalités observées dans values, dans l'ordre de leur première apparition : c'est l'ordre
+    qu'utilisent value_counts (à effectifs égaux) et seaborn pour une colonne de texte.
+    Pour une colonne de type "category", la recherche porte sur les codes entiers.
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return pd.Index(values.dropna().unique())
+    codes = pd.unique(values.cat.codes.to_numpy())
+    return values.cat.categories[codes[codes >= 0]]
+
+def _value_counts(values):
+    """
+    Effectifs par modalité, triés par ordre décroissant, les égalités restant dans l'ordre
+    de première apparition (comme value_counts sur la colonne de texte).
+    Pour une colonne de type "category", le comptage porte sur les codes entiers (np.bincount)
+    et seules les modalités observées sont conservées.
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return values.value_counts()
+    codes = values.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories))
+    order = values.cat.categories.get_indexer(_appearance_order(values))
+    result = pd.Series(counts[order], index=values.cat.categories[order], name='count')
+    return result.sort_values(ascending=False, kind='stable')
+
+def _bar_counts(ax, counts, palette, horizontal=False, palette_order=None):
+    """
+    Trace les effectifs déjà agrégés (counts : Series indexée par les modalités) en barres matplotlib,
+    une couleur de la palette par barre, avec la même mise en forme que countplot / barplot de seaborn
+    (largeur 0.8, couleurs désaturées, pas de grille sur l'axe des modalités).
+    palette_order : modalités dans l'ordre d'attribution des couleurs (par défaut celui des barres),
+    comme hue_order chez seaborn.
+    """
+    labels = [str(label) for label in counts.index]
+    positions = np.arange(len(labels))
+    if pd.api.types.is_numeric_dtype(counts.index) and len(labels) > 1:
+        # Modalités numériques (rating) : couleurs prises sur toute l'étendue de la palette
+        values = counts.index.to_numpy(dtype=float)
+        cmap = matplotlib.colormaps[palette]
+        colors = sns.color_palette(list(cmap((values - values.min()) / np.ptp(values))), desat=0.75)
+    elif palette_order is not None:
+        palette_colors = dict(zip(palette_order, sns.color_palette(palette, len(palette_order), desat=0.75)))
+        # Modalité absente de palette_order (effectif nul, barre invisible) : première couleur
+        colors = [palette_colors.get(label, palette_colors[palette_order[0]]) for label in counts.index]
+    else:
+        colors = sns.color_palette(palette, len(labels), desat=0.75)
+    if horizontal:
+        ax.barh(positions, counts.to_numpy(), height=0.8, color=colors)
+        ax.set_yticks(positions, labels)
+        ax.yaxis.grid(False)
+        # Première modalité en haut, comme seaborn
+        ax.set_ylim(len(labels) - 0.5, -0.5)
+    else:
+        ax.bar(positions, counts.to_numpy(), width=0.8, color=colors)
+        ax.set_xticks(positions, labels)
+        ax.xaxis.grid(False)
+        ax.set_xlim(-0.5, len(labels) - 0.5)
+
 def plot_rating_distribution(df):
     """Graphique en barres pour la distribution des livres par rating."""
-    plt.figure(figsize=(8, 6))
-    sns.set_style("whitegrid")
-    ax = sns.countplot(x='rating_int', data=df, hue='rating_int', palette="viridis",
-                       order=sorted(df['rating_int'].unique()), dodge=False)
+    fig, ax = plt.subplots(figsize=(8, 6))
+    _bar_counts(ax, df['rating_int'].value_counts().sort_index(), "viridis")
     ax.set_title("Nombre de livres par rating", fontsize=14)
     ax.set_xlabel("Rating", fontsize=12)
     ax.set_ylabel("Nombre de livres", fontsize=12)
-    legend = ax.get_legend()
-    if legend is not None:
-        legend.remove()
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "rating_distribution_seaborn.png"), dpi=300)
-    plt.show()
+    _save_figure(fig, "rating_distribution_seaborn.png")
 
 def plot_price_category_distribution(df):
     """Graphique en barres pour la distribution des livres par catégorie de prix."""
-    plt.figure(figsize=(8, 6))
-    sns.set_style("whitegrid")
-    ax = sns.countplot(x='price_category', data=df, hue='price_category', palette="Set2",
-                       order=['Low', 'Medium', 'High'], dodge=False)
+    fig, ax = plt.subplots(figsize=(8, 6))
+    counts = _value_counts(df['price_category']).reindex(['Low', 'Medium', 'High'], fill_value=0)
+    # Couleurs attribuées dans l'ordre d'apparition des catégories de prix, comme hue chez seaborn
+    _bar_counts(ax, counts, "Set2", palette_order=list(_appearance_order(df['price_category'])))
     ax.set_title("Nombre de livres par catégorie de prix", fontsize=14)
     ax.set_xlabel("Catégorie de prix", fontsize=12)
     ax.set_ylabel("Nombre de livres", fontsize=12)
-    legend = ax.get_legend()
-    if legend is not None:
-        legend.remove()
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "price_category_distribution_seaborn.png"), dpi=300)
-    plt.show()
+    _save_figure(fig, "price_category_distribution_seaborn.png")
+
+def _kde(values, grid_size=KDE_GRID_SIZE):
+    """
+    Densité estimée par noyau gaussien (largeur de bande de Scott, comme seaborn), évaluée sur
+    une grille régulière couvrant [min, max] des valeurs. Calcul exact pour au plus
+    KDE_EXACT_MAX_VALUES valeurs, approximation par FFT (_fft_kde) au-delà. Retourne (grille, densité).
+    """
+    if len(values) > KDE_EXACT_MAX_VALUES:
+        return _fft_kde(values, grid_size)
+    low, high = values.min(), values.max()
+    bandwidth = values.std(ddof=1) * len(values) ** (-1 / 5)
+    grid = np.linspace(low, high, grid_size)
+    kernel = np.exp(-0.5 * ((grid[:, None] - values[None, :]) / bandwidth) ** 2)
+    return grid, kernel.sum(axis=1) / (len(values) * bandwidth * np.sqrt(2 * np.pi))
+
+def _fft_kde(values, grid_size=KDE_GRID_SIZE):
+    """
+    Densité estimée par noyau gaussien (largeur de bande de Scott), évaluée sur une grille régulière
+    couvrant [min, max] des valeurs. Les valeurs sont réparties linéairement sur la grille (prolongée
+    de 4 largeurs de bande de chaque côté), puis convoluées avec le noyau par FFT :
+    coût en O(N + G log G) au lieu de O(N * G). Retourne (grille, densité).
+    """
+    low, high = values.min(), values.max()
+    bandwidth = values.std(ddof=1) * len(values) ** (-1 / 5)
+    step = (high - low) / (grid_size - 1)
+    pad = int(np.ceil(4 * bandwidth / step))
+    # Répartition linéaire de chaque valeur entre les deux points de grille voisins
+    position = (values - low) / step + pad
+    left = np.floor(position).astype(np.int64)
+    weight = position - left
+    size = grid_size + 2 * pad
+    counts = (np.bincount(left, weights=1 - weight, minlength=size + 1)
+              + np.bincount(left + 1, weights=weight, minlength=size + 1))[:size]
+    offsets = np.arange(-pad, pad + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (len(values) * bandwidth * np.sqrt(2 * np.pi))
+    n_fft = size + len(kernel) - 1
+    density = np.fft.irfft(np.fft.rfft(counts, n_fft) * np.fft.rfft(kernel, n_fft), n_fft)
+    # La convolution complète est décalée de pad points ; on ne garde que la grille [min, max]
+    density = density[2 * pad:2 * pad + grid_size]
+    return low + step * np.arange(grid_size), np.maximum(density, 0)
 
 def plot_price_histogram(df):
-    """Histogramme des prix avec courbe KDE."""
-    plt.figure(figsize=(8, 6))
-    sns.set_style("whitegrid")
-    ax = sns.histplot(df['price'], bins=30, kde=True, color='skyblue', edgecolor='black')
+    """
+    Histogramme des prix avec courbe KDE.
+    Les barres sont calculées avec np.histogram et la courbe KDE avec _kde (exacte, ou par
+    convolution FFT pour les grands jeux de données), toutes deux sur l'ensemble des prix.
+    Le rendu reprend celui de sns.histplot(kde=True) : transparence sur le remplissage des barres
+    seulement (bords noirs opaques), courbe de 1,5 pt.
+    """
+    fig, ax = plt.subplots(figsize=(8, 6))
+    prices = df['price'].to_numpy(dtype=float)
+    counts, edges = np.histogram(prices, bins=30)
+    widths = np.diff(edges)
+    ax.bar(edges[:-1], counts, width=widths, align='edge', color=to_rgba('skyblue', 0.5), edgecolor='black')
+    if len(prices) > 1 and prices.std() > 0:
+        grid, density = _kde(prices)
+        # Densité mise à l'échelle des effectifs de l'histogramme
+        ax.plot(grid, density * len(prices) * widths[0], color='skyblue', linewidth=1.5)
     ax.set_title("Histogramme des prix des livres", fontsize=14)
     ax.set_xlabel("Prix", fontsize=12)
     ax.set_ylabel("Fréquence", fontsize=12)
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "price_histogram_seaborn.png"), dpi=300)
-    plt.show()
+    _save_figure(fig, "price_histogram_seaborn.png")
 
 def plot_boxplot_price_by_rating(df):
     """Boxplot des prix par rating."""
-    plt.figure(figsize=(8, 6))
-    sns.set_style("whitegrid")
-    ax = sns.boxplot(x='rating_int', y='price', data=df, hue='rating_int', palette="Set3",
-                     order=sorted(df['rating_int'].unique()), dodge=False)
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.boxplot(x='rating_int', y='price', data=df, hue='rating_int', palette="Set3",
+                order=sorted(df['rating_int'].unique()), dodge=False, legend=False, ax=ax)
     ax.set_title("Boxplot des prix par rating", fontsize=14)
     ax.set_xlabel("Rating", fontsize=12)
     ax.set_ylabel("Prix", fontsize=12)
-    legend = ax.get_legend()
-    if legend is not None:
-        legend.remove()
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "boxplot_price_by_rating_seaborn.png"), dpi=300)
-    plt.show()
-
-# Graphiques utilisant les catégories en anglais
-def plot_top_categories_distribution_en(df):
-    """Graphique en barres pour le top 10 des catégories (anglais)."""
-    plt.figure(figsize=(10, 6))
-    sns.set_style("whitegrid")
-    cat_counts = df['category'].value_counts().nlargest(10).reset_index()
-    cat_counts.columns = ['category', 'count']
-    ax = sns.barplot(x='category', y='count', data=cat_counts, hue='category',
-                     palette="coolwarm", dodge=False)
-    ax.set_title("Top 10 des catégories de livres (Anglais)", fontsize=14)
-    ax.set_xlabel("Catégorie", fontsize=12)
-    ax.set_ylabel("Nombre de livres", fontsize=12)
-    legend = ax.get_legend()
-    if legend is not None:
-        legend.remove()
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "top_categories_distribution_en.png"), dpi=300)
-    plt.show()
-
-def plot_category_pie_chart_en(df):
-    """Diagramme circulaire pour le top 10 des catégories (anglais)."""
-    plt.figure(figsize=(8, 8))
-    cat_counts = df['category'].value_counts().nlargest(10)
-    plt.pie(cat_counts.values, labels=cat_counts.index, autopct='%1.1f%%', startangle=140,
-            colors=sns.color_palette("pastel"))
-    plt.title("Répartition des 10 principales catégories (Anglais)", fontsize=14)
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "category_pie_chart_en.png"), dpi=300)
-    plt.show()
-
-def plot_all_categories_distribution_en(df):
-    """Graphique en barres horizontales pour toutes les catégories (anglais)."""
-    plt.figure(figsize=(10, 12))
-    sns.set_style("whitegrid")
-    cat_counts = df['category'].value_counts().sort_values(ascending=True).reset_index()
-    cat_counts.columns = ['category', 'count']
-    ax = sns.barplot(x='count', y='category', data=cat_counts, hue='category',
-                     palette="viridis", dodge=False)
-    ax.set_title("Distribution de toutes les catégories de livres (Anglais)", fontsize=14)
-    ax.set_xlabel("Nombre de livres", fontsize=12)
-    ax.set_ylabel("Catégorie", fontsize=12)
-    legend = ax.get_legend()
-    if legend is not None:
-        legend.remove()
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "all_categories_distribution_en.png"), dpi=300)
-    plt.show()
-
-def plot_boxplot_price_by_category_en(df):
-    """Boxplot des prix pour le top 10 des catégories (anglais)."""
-    plt.figure(figsize=(12, 6))
-    sns.set_style("whitegrid")
-    top10 = df['category'].value_counts().nlargest(10).index
-    subset = df[df['category'].isin(top10)]
-    ax = sns.boxplot(x='category', y='price', data=subset, hue='category', palette="Set1", dodge=False)
-    ax.set_title("Boxplot des prix pour le top 10 des catégories (Anglais)", fontsize=14)
-    ax.set_xlabel("Catégorie", fontsize=12)
-    ax.set_ylabel("Prix", fontsize=12)
-    legend = ax.get_legend()
-    if legend is not None:
-        legend.remove()
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "boxplot_price_by_category_en.png"), dpi=300)
-    plt.show()
-
-# Graphiques utilisant les catégories en français
-def plot_top_categories_distribution_fr(df):
-    """Graphique en barres pour le top 10 des catégories (français)."""
-    plt.figure(figsize=(10, 6))
-    sns.set_style("whitegrid")
-    cat_counts = df['category_fr'].value_counts().nlargest(10).reset_index()
-    cat_counts.columns = ['category_fr', 'count']
-    ax = sns.barplot(x='category_fr', y='count', data=cat_counts, hue='category_fr',
-                     palette="coolwarm", dodge=False)
-    ax.set_title("Top 10 des catégories de livres (Français)", fontsize=14)
-    ax.set_xlabel("Catégorie (FR)", fontsize=12)
+    _save_figure(fig, "boxplot_price_by_rating_seaborn.png")
+
+# Graphiques par catégorie, paramétrés par les champs de CATEGORY_PLOT_SPECS dont ils ont besoin.
+# Les barres sont tracées à partir des effectifs déjà calculés. Pour le boxplot, l'ordre des catégories
+# est passé explicitement : avec une colonne de type "category" (Feather, Parquet), seaborn afficherait
+# sinon aussi les catégories absentes du graphique, dans l'ordre alphabétique.
+def plot_top_categories_distribution(top_counts, language, axis_label, suffix):
+    """Graphique en barres pour le top 10 des catégories (top_counts : effectifs des 10 premières)."""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    _bar_counts(ax, top_counts, "coolwarm")
+    ax.set_title(f"Top 10 des catégories de livres ({language})", fontsize=14)
+    ax.set_xlabel(axis_label, fontsize=12)
     ax.set_ylabel("Nombre de livres", fontsize=12)
-    legend = ax.get_legend()
-    if legend is not None:
-        legend.remove()
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "top_categories_distribution_fr.png"), dpi=300)
-    plt.show()
-
-def plot_category_pie_chart_fr(df):
-    """Diagramme circulaire pour le top 10 des catégories (français)."""
-    plt.figure(figsize=(8, 8))
-    cat_counts = df['category_fr'].value_counts().nlargest(10)
-    plt.pie(cat_counts.values, labels=cat_counts.index, autopct='%1.1f%%', startangle=140,
-            colors=sns.color_palette("pastel"))
-    plt.title("Répartition des 10 principales catégories (Français)", fontsize=14)
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "category_pie_chart_fr.png"), dpi=300)
-    plt.show()
-
-def plot_all_categories_distribution_fr(df):
-    """Graphique en barres horizontales pour toutes les catégories (français)."""
-    plt.figure(figsize=(10, 12))
-    sns.set_style("whitegrid")
-    cat_counts = df['category_fr'].value_counts().sort_values(ascending=True).reset_index()
-    cat_counts.columns = ['category_fr', 'count']
-    ax = sns.barplot(x='count', y='category_fr', data=cat_counts, hue='category_fr',
-                     palette="viridis", dodge=False)
-    ax.set_title("Distribution de toutes les catégories de livres (Français)", fontsize=14)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    _save_figure(fig, f"top_categories_distribution_{suffix}.png")
+
+def plot_category_pie_chart(top_counts, language, suffix):
+    """Diagramme circulaire pour le top 10 des catégories (top_counts : effectifs des 10 premières)."""
+    fig, ax = plt.subplots(figsize=(8, 8))
+    ax.pie(top_counts.values, labels=top_counts.index, autopct='%1.1f%%', startangle=140,
+           colors=sns.color_palette("pastel"))
+    ax.set_title(f"Répartition des 10 principales catégories ({language})", fontsize=14)
+    _save_figure(fig, f"category_pie_chart_{suffix}.png")
+
+def plot_all_categories_distribution(counts, language, axis_label, suffix):
+    """Graphique en barres horizontales pour toutes les catégories (counts : effectifs par catégorie)."""
+    fig, ax = plt.subplots(figsize=(10, 12))
+    _bar_counts(ax, counts.sort_values(ascending=True), "viridis", horizontal=True)
+    ax.set_title(f"Distribution de toutes les catégories de livres ({language})", fontsize=14)
     ax.set_xlabel("Nombre de livres", fontsize=12)
-    ax.set_ylabel("Catégorie (FR)", fontsize=12)
-    legend = ax.get_legend()
-    if legend is not None:
-        legend.remove()
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "all_categories_distribution_fr.png"), dpi=300)
-    plt.show()
-
-def plot_boxplot_price_by_category_fr(df):
-    """Boxplot des prix pour le top 10 des catégories (français)."""
-    plt.figure(figsize=(12, 6))
-    sns.set_style("whitegrid")
-    top10 = df['category_fr'].value_counts().nlargest(10).index
-    subset = df[df['category_fr'].isin(top10)]
-    ax = sns.boxplot(x='category_fr', y='price', data=subset, hue='category_fr', palette="Set1", dodge=False)
-    ax.set_title("Boxplot des prix pour le top 10 des catégories (Français)", fontsize=14)
-    ax.set_xlabel("Catégorie (FR)", fontsize=12)
+    ax.set_ylabel(axis_label, fontsize=12)
+    _save_figure(fig, f"all_categories_distribution_{suffix}.png")
+
+def top_categories_subset(df, column, top10):
+    """
+    Retourne les lignes de df dont la colonne column appartient aux catégories top10.
+    Pour une colonne de type "category", la comparaison porte sur les codes entiers
+    plutôt que sur les chaînes de caractères.
+    """
+    values = df[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        top_codes = values.cat.categories.get_indexer(top10)
+        mask = np.isin(values.cat.codes.to_numpy(), top_codes)
+    else:
+        mask = values.isin(top10).to_numpy()
+    return df[mask]
+
+def plot_boxplot_price_by_category(subset, top10, column, language, axis_label, suffix):
+    """
+    Boxplot des prix pour le top 10 des catégories.
+    subset contient uniquement les livres des catégories listées dans top10 ; les boîtes
+    (et leurs couleurs) suivent l'ordre d'apparition des catégories dans subset.
+    """
+    fig, ax = plt.subplots(figsize=(12, 6))
+    order = list(_appearance_order(subset[column]))
+    sns.boxplot(x=column, y='price', data=subset, hue=column, order=order, hue_order=order,
+                palette="Set1", dodge=False, legend=False, ax=ax)
+    ax.set_title(f"Boxplot des prix pour le top 10 des catégories ({language})", fontsize=14)
+    ax.set_xlabel(axis_label, fontsize=12)
     ax.set_ylabel("Prix", fontsize=12)
-    legend = ax.get_legend()
-    if legend is not None:
-        legend.remove()
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "boxplot_price_by_category_fr.png"), dpi=300)
-    plt.show()
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    _save_figure(fig, f"boxplot_price_by_category_{suffix}.png")
 
 def plot_violin_price_by_rating(df):
     """Violin plot des prix par rating."""
-    plt.figure(figsize=(8, 6))
-    sns.set_style("whitegrid")
-    ax = sns.violinplot(x='rating_int', y='price', data=df, hue='rating_int', palette="Set2", dodge=False)
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.violinplot(x='rating_int', y='price', data=df, hue='rating_int', palette="Set2", dodge=False,
+                   legend=False, ax=ax)
     ax.set_title("Violin plot des prix par rating", fontsize=14)
     ax.set_xlabel("Rating", fontsize=12)
     ax.set_ylabel("Prix", fontsize=12)
-    legend = ax.get_legend()
-    if legend is not None:
-        legend.remove()
-    plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, "violin_price_by_rating.png"), dpi=300)
-    plt.show()
+    _save_figure(fig, "violin_price_by_rating.png")
+
+def run_plots(plots):
+    """
+    Exécute les graphiques, donnés sous forme de tuples (fonction, arguments).
+    Chaque graphique est indépendant et écrit son propre fichier : en mode batch, ils sont
+    rendus en parallèle dans un pool de processus (matplotlib n'étant pas thread-safe) ;
+    sinon ils sont rendus l'un après l'autre pour pouvoir être affichés.
+    """
+    if not BATCH_MODE:
+        for plot, args in plots:
+            plot(*args)
+        return
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        futures = [executor.submit(plot, *args) for plot, args in plots]
+        for future in futures:
+            future.result()
 
 def main():
-    df = load_data()  # Charge depuis 'output/books_clean.csv'
+    """Génère et sauvegarde tous les graphiques. Retourne True si les données ont pu être chargées."""
+    df = load_data()  # Charge depuis 'output/books_clean.feather', '.parquet' ou '.csv'
     if df is None:
-        return
-    plot_rating_distribution(df)
-    plot_price_category_distribution(df)
-    plot_price_histogram(df)
-    plot_boxplot_price_by_rating(df)
-    # Graphiques en anglais
-    plot_top_categories_distribution_en(df)
-    plot_category_pie_chart_en(df)
-    plot_all_categories_distribution_en(df)
-    plot_boxplot_price_by_category_en(df)
-    # Graphiques en français
-    plot_top_categories_distribution_fr(df)
-    plot_category_pie_chart_fr(df)
-    plot_all_categories_distribution_fr(df)
-    plot_boxplot_price_by_category_fr(df)
+        return False
+    # Chaque graphique ne reçoit que les colonnes qu'il utilise : en mode batch,
+    # les arguments sont sérialisés vers les processus du pool
+    rating_price = df[['rating_int', 'price']]
+    plots = [
+        (plot_rating_distribution, (df[['rating_int']],)),
+        (plot_price_category_distribution, (df[['price_category']],)),
+        (plot_price_histogram, (df[['price']],)),
+        (plot_boxplot_price_by_rating, (rating_price,)),
+    ]
+    # Graphiques par catégorie, en anglais puis en français : les effectifs par catégorie,
+    # le top 10 et le sous-ensemble correspondant sont calculés une seule fois par langue
+    for column, language, axis_label, suffix in CATEGORY_PLOT_SPECS:
+        counts = _value_counts(df[column])
+        top_counts = counts.nlargest(10)
+        top10 = top_counts.index
+        plots += [
+            (plot_top_categories_distribution, (top_counts, language, axis_label, suffix)),
+            (plot_category_pie_chart, (top_counts, language, suffix)),
+            (plot_all_categories_distribution, (counts, language, axis_label, suffix)),
+            (plot_boxplot_price_by_category, (top_categories_subset(df[[column, 'price']], column, top10),
+                                              top10, column, language, axis_label, suffix)),
+        ]
     # Autre graphique commun
-    plot_violin_price_by_rating(df)
+    plots.append((plot_violin_price_by_rating, (rating_price,)))
+    run_plots(plots)
+    return True
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
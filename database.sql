@@ -17,6 +17,10 @@ CREATE TABLE IF NOT EXISTS books (
     category VARCHAR(255) DEFAULT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- Optionnel : autoriser LOAD DATA LOCAL INFILE, utilisé par scraping.py pour charger
+-- output/books.csv en une seule instruction (sinon insertion par lots avec executemany)
+-- SET GLOBAL local_infile = 1;
+
 -- Pour afficher les tables et leur contenu :
 SHOW TABLES;
 DESCRIBE books;
@@ -11,8 +11,13 @@ This script provides an interactive menu to run:
 5. Exit
 
 It uses the rich library to display colorful messages.
+Run with --pipeline to skip the menu and execute the full ETL pipeline directly (e.g. from cron or CI).
+The full pipeline skips the stages whose outputs are already up to date; add --force to re-run them all.
 """
 
+import argparse
+import json
+import os
 import time
 from rich.console import Console
 from rich.panel import Panel
@@ -24,37 +29,109 @@ import data_visualization
 
 console = Console()
 
+# Output files of each stage (they must still exist for the stage to be skipped)
+RAW_DATA_FILE = os.path.join("output", "books.csv")
+CLEAN_DATA_FILE = os.path.join("output", "books_clean.csv")
+# Untracked file (see .gitignore) recording when each stage last completed successfully.
+# File modification times cannot be used: the outputs are versioned, so a fresh checkout
+# would make them all look new.
+STAMP_FILE = os.path.join("output", ".pipeline_stamps.json")
+# Scraped data younger than this (in seconds) is not scraped again by the full pipeline
+SCRAPE_MAX_AGE = 24 * 60 * 60
+
+
+def read_stamps():
+    """Return the {stage: completion time} mapping stored in STAMP_FILE (empty if missing or invalid)."""
+    try:
+        with open(STAMP_FILE, encoding="utf-8") as f:
+            stamps = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return stamps if isinstance(stamps, dict) else {}
+
+
+def write_stamp(stage):
+    """Record that the given stage has just completed successfully."""
+    stamps = read_stamps()
+    stamps[stage] = time.time()
+    os.makedirs(os.path.dirname(STAMP_FILE), exist_ok=True)
+    with open(STAMP_FILE, "w", encoding="utf-8") as f:
+        json.dump(stamps, f)
+
+
+def completed_after(stage, previous_stage):
+    """Return True if stage has completed strictly after the last completion of previous_stage."""
+    stamps = read_stamps()
+    return (stage in stamps and previous_stage in stamps
+            and stamps[stage] > stamps[previous_stage])
+
+
+def scraping_up_to_date():
+    scraped = read_stamps().get("scraping")
+    return (scraped is not None and os.path.exists(RAW_DATA_FILE)
+            and time.time() - scraped < SCRAPE_MAX_AGE)
+
+
+def cleaning_up_to_date():
+    return completed_after("cleaning", "scraping") and os.path.exists(CLEAN_DATA_FILE)
+
+
+def visualization_up_to_date():
+    images = [os.path.join(data_visualization.image_dir, name) for name in data_visualization.IMAGE_FILES]
+    return (completed_after("visualization", "cleaning")
+            and all(os.path.exists(path) for path in images))
+
+
+def skip_stage(name, reason):
+    console.print(f"[yellow]Skipping {name}: {reason} (use --force to re-run it).[/yellow]")
+
 
 def run_scraping():
     console.print(Panel("Starting Scraping Process...", style="bold green"))
-    scraping.main()
+    if scraping.main():
+        write_stamp("scraping")
     console.print(Panel("Scraping completed successfully.", style="bold green"))
 
 
 def run_cleaning_analysis():
     console.print(Panel("Starting Data Cleaning and Analysis...", style="bold blue"))
-    data_cleaning_analysis.main()
+    if data_cleaning_analysis.main():
+        write_stamp("cleaning")
     console.print(Panel("Data Cleaning and Analysis completed successfully.", style="bold blue"))
 
 
 def run_visualization():
     console.print(Panel("Starting Data Visualization...", style="bold magenta"))
-    data_visualization.main()
+    if data_visualization.main():
+        write_stamp("visualization")
     console.print(Panel("Data Visualization completed successfully.", style="bold magenta"))
 
 
-def run_full_pipeline():
+def run_full_pipeline(force=False):
     console.print(Panel("Running Full ETL Pipeline...", style="bold yellow"))
-    run_scraping()
-    time.sleep(1)
-    run_cleaning_analysis()
-    time.sleep(1)
-    run_visualization()
-    time.sleep(1)
+    if force or not scraping_up_to_date():
+        run_scraping()
+    else:
+        # The MySQL insertion is part of the scraping stage: it is skipped too
+        skip_stage("scraping and MySQL insertion",
+                   f"the last successful scrape is less than {SCRAPE_MAX_AGE // 3600} hours old")
+    if force or not cleaning_up_to_date():
+        run_cleaning_analysis()
+    else:
+        skip_stage("data cleaning", "the data has already been cleaned since the last scrape")
+    if force or not visualization_up_to_date():
+        # The pipeline runs unattended: plots are only saved (Agg backend, no plt.show())
+        previous_batch_mode = data_visualization.set_batch_mode(True)
+        try:
+            run_visualization()
+        finally:
+            data_visualization.set_batch_mode(previous_batch_mode)
+    else:
+        skip_stage("data visualization", "the plots have already been generated since the last cleaning")
     console.print(Panel("Full ETL Pipeline executed successfully!", style="bold green"))
 
 
-def interactive_menu():
+def interactive_menu(force=False):
     while True:
         console.print(Panel("BooksToScrape_ETL Interactive Menu", style="bold underline cyan"))
         console.print("[1] Run Scraping and Database Insertion")
@@ -71,7 +148,7 @@ def interactive_menu():
         elif choice == "3":
             run_visualization()
         elif choice == "4":
-            run_full_pipeline()
+            run_full_pipeline(force=force)
         elif choice == "5":
             console.print(Panel("Exiting. Goodbye!", style="bold red"))
             break
@@ -81,8 +158,21 @@ def interactive_menu():
         time.sleep(1)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="BooksToScrape_ETL")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="run the full ETL pipeline without the interactive menu")
+    parser.add_argument("--force", action="store_true",
+                        help="re-run every pipeline stage, even when its outputs are up to date")
+    return parser.parse_args()
+
+
 def main():
-    interactive_menu()
+    args = parse_args()
+    if args.pipeline:
+        run_full_pipeline(force=args.force)
+    else:
+        interactive_menu(force=args.force)
 
 
 if __name__ == '__main__':
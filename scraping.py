@@ -16,36 +16,126 @@ Il affiche également la durée totale du scraping.
 
 import os
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 import csv
 import json
-import pandas as pd
 import mysql.connector
+from openpyxl import Workbook
+import mysql.connector.pooling
 from mysql.connector import Error
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import concurrent.futures
+from operator import itemgetter
 from urllib.parse import urljoin
 import time
 from tqdm import tqdm  # pour afficher la progression
 from tqdm import tqdm  # Pour afficher la progression
 
+# Sérialiseurs optionnels plus rapides (repli sur json / openpyxl sinon)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
 # Définir le dossier de sortie pour les fichiers exportés
 output_dir = "output"
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
-# Création d'une session globale pour réutiliser les connexions
+# Nombre de threads : pages listing téléchargées en parallèle, et pages détail (catégories)
+LISTING_WORKERS = 16
+CATEGORY_WORKERS = 32
+
+# Création d'une session globale pour réutiliser les connexions.
+# pool_maxsize (nombre de connexions conservées par hôte) est dimensionné pour toutes les
+# requêtes simultanées (sinon les connexions au-delà de 10 sont fermées après usage),
+# avec quelques nouvelles tentatives en cas d'erreur de connexion.
 session = requests.Session()
+adapter = HTTPAdapter(pool_maxsize=max(LISTING_WORKERS, CATEGORY_WORKERS),
+                      max_retries=Retry(total=3, backoff_factor=0.3))
+session.mount('http://', adapter)
+session.mount('https://', adapter)
+
+# Encodage des pages de Books to Scrape, utilisé quand l'en-tête Content-Type n'en précise pas
+# (évite la détection statistique de response.apparent_encoding sur chaque réponse)
+SITE_ENCODING = 'utf-8'
+
+# Délai maximal (en secondes) de connexion et de lecture d'une réponse HTTP
+REQUEST_TIMEOUT = 10
+
+# Nombre de lignes par requête INSERT multi-valeurs (borne la taille des paquets envoyés à MySQL)
+INSERT_BATCH_SIZE = 1000
+
+# Taille du tampon d'écriture du fichier CSV (1 Mio)
+CSV_BUFFER_SIZE = 1 << 20
+
+# Pools de connexions MySQL (un par serveur / base), créés à la première insertion
+# et réutilisés lors des exécutions suivantes dans le même processus (ex. menu de main.py)
+mysql_pools = {}
+
+# Champs extraits pour chaque livre, dans l'ordre des fichiers exportés et de la table MySQL
+BOOK_FIELDS = ('title', 'price', 'rating', 'product_link', 'category')
+
+# Dictionnaire pour convertir la note en entier
+RATING_MAPPING = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
+
+# Expressions XPath, compilées une seule fois (parcours de l'arbre lxml en C)
+def _has_class(name):
+    """Condition XPath : l'attribut class contient la classe name."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+ARTICLES_XPATH = etree.XPath(f"//article[{_has_class('product_pod')}]")
+TITLE_LINK_XPATH = etree.XPath("./h3/a")
+PRICE_XPATH = etree.XPath(f"string(.//p[{_has_class('price_color')}])")
+RATING_CLASS_XPATH = etree.XPath(f"string(.//p[{_has_class('star-rating')}]/@class)")
+NEXT_HREF_XPATH = etree.XPath(f"string(//li[{_has_class('next')}]/a/@href)")
+CURRENT_PAGE_XPATH = etree.XPath(f"string((//li[{_has_class('current')}])[1])")
+# Liens des catégories dans le menu latéral des pages listing (sous-liste de "Books")
+CATEGORY_LINKS_XPATH = etree.XPath(f"//div[{_has_class('side_categories')}]//li/ul/li/a")
+# Liens du fil d'ariane d'une page détail (la catégorie est le dernier)
+BREADCRUMB_LINKS_XPATH = etree.XPath(f"(//ul[{_has_class('breadcrumb')}])[1]//a")
+
+def _link_resolver(page_url):
+    """
+    Retourne une fonction qui résout les liens relatifs de la page page_url, comme urljoin.
+    urljoin n'est appelé qu'une fois par préfixe de remontée ('', '../', '../../../'...) ;
+    le reste du lien, un simple chemin (ex. 'the-grand-design_405/index.html'), est concaténé.
+    Les autres formes de liens (absolus, '/...', './', '?', '#') passent par urljoin.
+    """
+    bases = {}
+
+    def resolve(link):
+        path = link
+        while path.startswith('../'):
+            path = path[3:]
+        if not path or path.startswith(('/', '.', '?', '#')) or ':' in path or '/.' in path:
+            return urljoin(page_url, link)
+        prefix = link[:len(link) - len(path)]
+        base = bases.get(prefix)
+        if base is None:
+            base = bases[prefix] = urljoin(page_url, prefix or '.')
+        return base + path
+
+    return resolve
 
 def fetch_page(url):
     """
-    Télécharge le contenu HTML de la page spécifiée en gérant l'encodage Unicode.
-    Retourne un tuple (html, effective_url) ou (None, url) en cas d'erreur.
+    Télécharge la page spécifiée en gérant l'encodage Unicode (celui de l'en-tête
+    Content-Type s'il est indiqué, SITE_ENCODING sinon) et l'analyse une seule fois avec lxml.
+    Retourne un tuple (tree, effective_url), tree étant l'arbre lxml de la page,
+    ou (None, url) en cas d'erreur.
     """
     try:
-        response = session.get(url)
+        response = session.get(url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        response.encoding = response.apparent_encoding
-        return response.text, response.url
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            response.encoding = SITE_ENCODING
+        return lxml_html.fromstring(response.text), response.url
     except Exception as e:
         print(f"Erreur lors du téléchargement de la page {url} : {e}")
         time.sleep(0.2)
@@ -56,63 +146,38 @@ def fetch_category(product_link):
     Récupère la catégorie du livre en analysant la page détaillée (product_link).
     Retourne la catégorie (ex. 'Historical Fiction') ou None si introuvable.
     """
-    detail_html, _ = fetch_page(product_link)
-    if not detail_html:
+    detail_tree, _ = fetch_page(product_link)
+    if detail_tree is None:
         return None
 
-    soup_detail = BeautifulSoup(detail_html, "html.parser")
-    breadcrumb = soup_detail.find("ul", class_="breadcrumb")
-    if breadcrumb:
-        links = breadcrumb.find_all("a")
-        # Sur Books To Scrape, le fil d'ariane typique est : Home > Books > [Category] > [Titre sans lien]
-        if len(links) >= 3:
-            return links[-1].get_text(strip=True)
+    links = BREADCRUMB_LINKS_XPATH(detail_tree)
+    # Sur Books To Scrape, le fil d'ariane typique est : Home > Books > [Category] > [Titre sans lien]
+    if len(links) >= 3:
+        return links[-1].text_content().strip()
     return None
 
-def parse_books(html, page_url):
+def extract_listing(tree, page_url):
     """
-    Analyse le HTML et extrait les données des livres de la page.
-    Retourne une liste de dictionnaires contenant :
-        - title        : le titre du livre
-        - price        : le prix (float)
-        - rating       : la note (1, 2, 3, 4, 5)
-        - product_link : le lien absolu vers le détail du produit
-        - category     : la catégorie extraite de la page de détail
+    Extrait les livres d'une page listing déjà analysée (arbre lxml), sans leur catégorie
+    (category vaut None, voir fetch_categories). Retourne la liste des livres.
     """
-    soup = BeautifulSoup(html, 'html.parser')
     books_data = []
-    articles = soup.find_all('article', class_='product_pod')
-
-    # Dictionnaire pour convertir la note en entier
-    rating_mapping = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
-
-    # Première boucle : extraire les infos de base et collecter les liens produits
-    product_links = []
-    for article in articles:
-        h3 = article.find('h3')
-        a_tag = h3.find('a')
+    # Utiliser page_url pour résoudre correctement les liens relatifs
+    resolve = _link_resolver(page_url)
+    for article in ARTICLES_XPATH(tree):
+        a_tag = TITLE_LINK_XPATH(article)[0]
         title = a_tag.get('title', '').strip()
 
         link = a_tag.get('href', '').strip()
-        # Utiliser page_url pour résoudre correctement les liens relatifs
-        product_link = urljoin(page_url, link)
-        product_links.append(product_link)
-
-        # Extraction et conversion du prix
-        price_tag = article.find('p', class_='price_color')
-        price_str = price_tag.text.strip() if price_tag else "0"
-        # Suppression du symbole '£' et conversion en float
-        price_value = float(price_str.replace('£', '').strip())
-
-        # Extraction et conversion de la note (rating)
-        rating_tag = article.find('p', class_='star-rating')
-        rating = 0  # valeur par défaut
-        if rating_tag:
-            classes = rating_tag.get("class", [])
-            for cls in classes:
-                if cls in rating_mapping:
-                    rating = rating_mapping[cls]
-                    break
+        product_link = resolve(link)
+
+        # Extraction et conversion du prix : suppression du symbole '£' en tête
+        # (float() ignore lui-même les espaces autour du nombre)
+        price_value = float(PRICE_XPATH(article).strip().lstrip('£') or 0)
+
+        # Extraction et conversion de la note (rating) à partir des classes "star-rating Three"
+        rating_classes = RATING_CLASS_XPATH(article).split()
+        rating = next((RATING_MAPPING[cls] for cls in rating_classes if cls in RATING_MAPPING), 0)
 
         books_data.append({
             "title": title,
@@ -121,98 +186,185 @@ def parse_books(html, page_url):
             "product_link": product_link,
             "category": None  # à renseigner ensuite
         })
+    return books_data
+
+def fetch_category_links(category_url):
+    """
+    Parcourt les pages listing d'une catégorie en suivant la pagination.
+    Retourne la liste des liens absolus vers les produits de la catégorie.
+    """
+    product_links = []
+    current_url = category_url
+    while current_url:
+        tree, effective_url = fetch_page(current_url)
+        if tree is None:
+            break
+        resolve = _link_resolver(effective_url)
+        for article in ARTICLES_XPATH(tree):
+            product_links.append(resolve(TITLE_LINK_XPATH(article)[0].get('href', '').strip()))
+        next_href = NEXT_HREF_XPATH(tree)
+        current_url = urljoin(effective_url, next_href) if next_href else None
+    return product_links
 
-    # Deuxième boucle : récupérer les catégories en parallèle pour chaque produit
-    with concurrent.futures.ThreadPoolExecutor(max_workers=15) as executor:
-        categories = list(tqdm(executor.map(fetch_category, product_links),
-                               total=len(product_links),
-                               desc="Récupération des catégories"))
-    # Affecter les catégories aux livres
-    for i, book in enumerate(books_data):
-        book["category"] = categories[i]
+def fetch_category_map(tree, page_url):
+    """
+    Construit la correspondance lien produit -> catégorie à partir des pages listing des catégories,
+    dont les liens sont lus dans le menu latéral d'une page listing déjà analysée (arbre lxml).
+    Environ 50 catégories (quelques dizaines de pages) au lieu d'une page détail par livre.
+    """
+    resolve = _link_resolver(page_url)
+    categories = [(link.text_content().strip(), resolve(link.get('href', '').strip()))
+                  for link in CATEGORY_LINKS_XPATH(tree)]
+    category_map = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=CATEGORY_WORKERS) as executor:
+        results = executor.map(fetch_category_links, [url for _, url in categories])
+        for (name, _), product_links in zip(categories, tqdm(results, total=len(categories),
+                                                              desc="Récupération des catégories")):
+            for product_link in product_links:
+                category_map[product_link] = name
+    return category_map
+
+def fetch_categories(books, category_map=None):
+    """
+    Renseigne la catégorie de chaque livre : d'après category_map (voir fetch_category_map)
+    lorsque le lien produit y figure, sinon en téléchargeant en parallèle les pages détail.
+    Un seul pool de threads est utilisé pour toute la liste, quel que soit le nombre de pages listing.
+    """
+    missing = []
+    for book in books:
+        category = category_map.get(book["product_link"]) if category_map else None
+        if category is None:
+            missing.append(book)
+        book["category"] = category
+    if not missing:
+        return
+    with concurrent.futures.ThreadPoolExecutor(max_workers=CATEGORY_WORKERS) as executor:
+        categories = executor.map(fetch_category, [book["product_link"] for book in missing])
+        for book, category in zip(missing, tqdm(categories, total=len(missing),
+                                                desc="Récupération des catégories (pages détail)")):
+            book["category"] = category
 
+def extract_books(tree, page_url):
+    """
+    Extrait les livres d'une page listing déjà analysée (arbre lxml) et récupère leur catégorie
+    sur les pages détail. Retourne une liste de dictionnaires contenant :
+        - title        : le titre du livre
+        - price        : le prix (float)
+        - rating       : la note (1, 2, 3, 4, 5)
+        - product_link : le lien absolu vers le détail du produit
+        - category     : la catégorie extraite de la page de détail
+    """
+    books_data = extract_listing(tree, page_url)
+    fetch_categories(books_data)
     return books_data
 
-def fetch_all_pages(base_url):
+def parse_listing(tree, page_url):
+    """
+    Analyse une page listing déjà analysée (arbre lxml) avec les expressions XPath précompilées.
+    Retourne un tuple (books, next_url) :
+        - books    : la liste des livres de la page (voir extract_books)
+        - next_url : l'URL absolue de la page suivante, ou None s'il n'y en a pas
+    """
+    books_data = extract_books(tree, page_url)
+
+    # Lien vers la page suivante, extrait du même arbre
+    next_href = NEXT_HREF_XPATH(tree)
+    next_url = urljoin(page_url, next_href) if next_href else None
+
+    return books_data, next_url
+
+def fetch_all_pages(base_url, first_page=None):
     """
     Parcourt toutes les pages du site en suivant la pagination.
+    first_page : tuple (tree, effective_url) renvoyé par fetch_page pour base_url,
+    si la première page a déjà été téléchargée (elle n'est alors pas retéléchargée).
     Retourne la liste complète des livres extraits.
     """
     current_url = base_url
     all_books = []
     while current_url:
         print("Scraping page :", current_url)
-        html, effective_url = fetch_page(current_url)
-        if html is None:
-            break
-        books = parse_books(html, effective_url)
-        all_books.extend(books)
-        soup = BeautifulSoup(html, 'html.parser')
-        next_li = soup.find('li', class_='next')
-        if next_li:
-            next_a = next_li.find('a')
-            if next_a:
-                next_href = next_a.get('href')
-                current_url = urljoin(effective_url, next_href)
-            else:
-                break
+        if first_page is not None:
+            (tree, effective_url), first_page = first_page, None
         else:
+            tree, effective_url = fetch_page(current_url)
+        if tree is None:
             break
+        # Un seul arbre par page pour les livres et le lien vers la page suivante
+        books, current_url = parse_listing(tree, effective_url)
+        all_books.extend(books)
     return all_books
 
+def fetch_listing(url):
+    """
+    Télécharge une page listing et en extrait les livres, sans leur catégorie (voir extract_listing).
+    Retourne une liste vide si la page n'a pas pu être téléchargée.
+    """
+    tree, effective_url = fetch_page(url)
+    if tree is None:
+        return []
+    return extract_listing(tree, effective_url)
+
 def fetch_all_pages_concurrent(base_url):
     """
-    Parcourt toutes les pages du site en parallèle en suivant la pagination.
-    On part du principe que le site comporte 50 pages (ou on peut extraire ce nombre depuis la première page).
+    Parcourt toutes les pages du site en parallèle.
+    Le nombre de pages est extrait de la pagination de la première page ("Page 1 of 50") ;
+    les pages suivantes, d'URL prévisible (catalogue/page-N.html), sont alors téléchargées
+    en parallèle via la session partagée. Les catégories de tous les livres sont ensuite
+    déduites des pages listing des catégories (fetch_category_map), les pages détail
+    n'étant téléchargées que pour les livres absents de ces listes. Si la pagination n'est pas numérotée,
+    on se rabat sur le parcours séquentiel (fetch_all_pages).
     Retourne la liste complète des livres extraits.
     """
-    first_html, first_effective_url = fetch_page(base_url)
-    if not first_html:
+    first_tree, first_effective_url = fetch_page(base_url)
+    if first_tree is None:
         return []
-    soup = BeautifulSoup(first_html, 'html.parser')
-    current_page_text = soup.find("li", class_="current")
+    current_page_text = CURRENT_PAGE_XPATH(first_tree).strip()
+    num_pages = None
     if current_page_text:
         try:
-            num_pages = int(current_page_text.get_text(strip=True).split()[-1])
-        except Exception as e:
-            print("Impossible d'extraire le nombre de pages, utilisation de 50 par défaut.")
-            num_pages = 50
-    else:
-        num_pages = 50
-
-    # Générer la liste des URLs : la première page est base_url, puis les pages suivantes
-    urls = [base_url]
-    for i in range(2, num_pages + 1):
-        page_url = f"http://books.toscrape.com/catalogue/page-{i}.html"
-        urls.append(page_url)
-
-    books = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-        results = list(executor.map(fetch_page, urls))
+            num_pages = int(current_page_text.split()[-1])
+        except ValueError:
+            print("Impossible d'extraire le nombre de pages.")
+    if num_pages is None:
+        print("Pagination non numérotée : parcours séquentiel des pages.")
+        return fetch_all_pages(base_url, first_page=(first_tree, first_effective_url))
+
+    # La première page est déjà téléchargée : seules les pages suivantes restent à récupérer
+    urls = [urljoin(first_effective_url, f"/catalogue/page-{i}.html") for i in range(2, num_pages + 1)]
+
+    books = extract_listing(first_tree, first_effective_url)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=LISTING_WORKERS) as executor:
+        # Chaque page est analysée dans le thread qui l'a téléchargée, pendant que les autres
+        # téléchargements se poursuivent ; les résultats restent dans l'ordre des pages
+        results = executor.map(fetch_listing, urls)
         # Utilisation de tqdm pour afficher la progression dans le traitement des pages
-        for html, effective_url in tqdm(results, total=len(results), desc="Traitement des pages listing"):
-            if html:
-                books.extend(parse_books(html, effective_url))
+        for page_books in tqdm(results, total=len(urls), desc="Traitement des pages listing"):
+            books.extend(page_books)
+
+    # Catégories lues sur les listes par catégorie ; pages détail seulement pour les livres manquants
+    fetch_categories(books, fetch_category_map(first_tree, first_effective_url))
     return books
 
 def save_data_csv(books, filename="books.csv"):
     """
     Sauvegarde la liste des livres dans un fichier CSV dans le dossier 'output'.
+    Retourne le chemin du fichier écrit, ou None en cas d'échec.
     """
     if not books:
         print("Aucun livre à sauvegarder en CSV.")
-        return
-    keys = books[0].keys()
+        return None
     try:
         filepath = os.path.join(output_dir, filename)
-        with open(filepath, mode='w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            for book in books:
-                writer.writerow(book)
+        with open(filepath, mode='w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(BOOK_FIELDS)
+            writer.writerows(map(itemgetter(*BOOK_FIELDS), books))
         print(f"Les données ont été sauvegardées dans le fichier {filepath}")
+        return filepath
     except Exception as e:
         print(f"Erreur lors de la sauvegarde en CSV : {e}")
+        return None
 
 def save_data_json(books, filename="books.json"):
     """
@@ -220,8 +372,13 @@ def save_data_json(books, filename="books.json"):
     """
     try:
         filepath = os.path.join(output_dir, filename)
-        with open(filepath, mode='w', encoding='utf-8') as f:
-            json.dump(books, f, ensure_ascii=False, indent=4)
+        if orjson is not None:
+            # orjson produit directement de l'UTF-8 : une seule écriture binaire
+            with open(filepath, mode='wb') as f:
+                f.write(orjson.dumps(books, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, mode='w', encoding='utf-8') as f:
+                json.dump(books, f, ensure_ascii=False, indent=4)
         print(f"Les données ont été sauvegardées dans le fichier {filepath}")
     except Exception as e:
         print(f"Erreur lors de la sauvegarde en JSON : {e}")
@@ -229,58 +386,129 @@ def save_data_json(books, filename="books.json"):
 def save_data_excel(books, filename="books.xlsx"):
     """
     Sauvegarde la liste des livres dans un fichier Excel dans le dossier 'output'.
+    Les lignes sont écrites directement, au fil de l'eau, sans passer par un DataFrame :
+    avec xlsxwriter (mode constant_memory) s'il est installé, sinon avec openpyxl en mode write_only.
     """
     try:
         filepath = os.path.join(output_dir, filename)
-        df = pd.DataFrame(books)
-        df.to_excel(filepath, index=False)
+        rows = map(itemgetter(*BOOK_FIELDS), books)
+        if xlsxwriter is not None:
+            workbook = xlsxwriter.Workbook(filepath, {'constant_memory': True})
+            worksheet = workbook.add_worksheet('Sheet1')
+            worksheet.write_row(0, 0, BOOK_FIELDS)
+            for row_index, row in enumerate(rows, start=1):
+                worksheet.write_row(row_index, 0, row)
+            workbook.close()
+        else:
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet('Sheet1')
+            worksheet.append(BOOK_FIELDS)
+            for row in rows:
+                worksheet.append(row)
+            workbook.save(filepath)
         print(f"Les données ont été sauvegardées dans le fichier {filepath}")
     except Exception as e:
         print(f"Erreur lors de la sauvegarde en Excel : {e}")
 
-def insert_data_mysql(books, host='localhost', user='root', password='12345678', database='books_scrape'):
+def get_mysql_connection(host, user, password, database):
     """
-    Insère la liste des livres dans la table MySQL après avoir vidé la table.
-    AVANT d'exécuter ce script, assurez-vous que la table 'books'
-    contient bien une colonne 'category' (ex. ALTER TABLE books ADD COLUMN category VARCHAR(255);).
+    Retourne une connexion MySQL (transactions explicites) issue du pool associé à ces paramètres ;
+    le pool est créé au premier appel. connection.close() rend la connexion au pool.
     """
-    connection = None
-    try:
-        connection = mysql.connector.connect(
+    # Le mot de passe fait partie de la clé : des identifiants corrigés ouvrent un nouveau pool
+    key = (host, user, password, database)
+    pool = mysql_pools.get(key)
+    if pool is None:
+        pool = mysql.connector.pooling.MySQLConnectionPool(
+            pool_name=f"books_scrape_{len(mysql_pools)}",
+            pool_size=1,  # une seule insertion à la fois
             host=host,
             user=user,
             password=password,
             database=database,
-            auth_plugin='mysql_native_password'
+            auth_plugin='mysql_native_password',
+            autocommit=False,
+            # LOAD DATA LOCAL INFILE autorisé uniquement pour les fichiers du dossier 'output'
+            allow_local_infile_in_path=os.path.abspath(output_dir)
         )
+        mysql_pools[key] = pool
+    return pool.get_connection()
+
+def load_csv_mysql(cursor, csv_path):
+    """
+    Charge le fichier CSV écrit par save_data_csv dans la table books en une seule instruction
+    LOAD DATA LOCAL INFILE (chargeur en masse du serveur). Les catégories vides redeviennent NULL.
+    Nécessite local_infile=1 côté serveur ; lève mysql.connector.Error sinon.
+    """
+    cursor.execute("""
+        LOAD DATA LOCAL INFILE %s INTO TABLE books
+        CHARACTER SET utf8mb4
+        FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+        LINES TERMINATED BY '\\r\\n'
+        IGNORE 1 LINES
+        (title, price, rating, product_link, @category)
+        SET category = NULLIF(@category, '')
+    """, (os.path.abspath(csv_path),))
+
+def insert_data_mysql(books, host='localhost', user='root', password='12345678', database='books_scrape',
+                      csv_path=None):
+    """
+    Insère la liste des livres dans la table MySQL après avoir vidé la table.
+    Si csv_path (fichier écrit par save_data_csv) est fourni, les données sont chargées avec
+    LOAD DATA LOCAL INFILE ; en cas de refus du serveur, on se rabat sur executemany.
+    AVANT d'exécuter ce script, assurez-vous que la table 'books'
+    contient bien une colonne 'category' (ex. ALTER TABLE books ADD COLUMN category VARCHAR(255);).
+    """
+    connection = None
+    cursor = None
+    try:
+        connection = get_mysql_connection(host, user, password, database)
         if connection.is_connected():
             cursor = connection.cursor()
+            # TRUNCATE valide implicitement la transaction en cours (instruction DDL sous MySQL)
             cursor.execute("TRUNCATE TABLE books;")
-            connection.commit()
 
-            insert_query = """
-                INSERT INTO books (title, price, rating, product_link, category)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            for book in books:
-                data = (
-                    book['title'],
-                    book['price'],
-                    book['rating'],
-                    book['product_link'],
-                    book['category']
-                )
-                cursor.execute(insert_query, data)
+            loaded = False
+            if csv_path:
+                try:
+                    load_csv_mysql(cursor, csv_path)
+                    loaded = True
+                except mysql.connector.Error as e:
+                    print("LOAD DATA LOCAL INFILE indisponible, insertion par lots :", e)
+            if not loaded:
+                insert_query = """
+                    INSERT INTO books (title, price, rating, product_link, category)
+                    VALUES (%s, %s, %s, %s, %s)
+                """
+                # Extraction des tuples en C (itemgetter) plutôt que par accès successifs aux clés
+                rows = list(map(itemgetter(*BOOK_FIELDS), books))
+                # executemany regroupe chaque lot en une requête INSERT multi-valeurs ;
+                # tous les lots sont validés en une seule transaction
+                for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                    cursor.executemany(insert_query, rows[start:start + INSERT_BATCH_SIZE])
             connection.commit()
             print("Les données ont été insérées dans la base de données MySQL après vidage de la table.")
     except mysql.connector.Error as e:
         print("Erreur lors de l'insertion dans MySQL :", e)
-    finally:
         if connection is not None and connection.is_connected():
+            connection.rollback()
+    finally:
+        if cursor is not None and connection.is_connected():
             cursor.close()
-            connection.close()
+        if connection is not None:
+            # Pour une connexion du pool, close() est le seul moyen de la lui rendre, même si le
+            # serveur l'a coupée (get_connection() la reconnectera) ; sinon le pool reste épuisé.
+            # La réinitialisation de session peut alors échouer : la connexion est rendue malgré tout.
+            try:
+                connection.close()
+            except mysql.connector.Error:
+                pass
 
 def main():
+    """
+    Scrape le site, sauvegarde les données (CSV, JSON, Excel) puis les insère dans MySQL.
+    Retourne True si le fichier CSV a été écrit.
+    """
     base_url = "http://books.toscrape.com/"
     print("Début du scraping du site :", base_url)
     start_time = time.time()  # Démarrage du chronomètre
@@ -294,12 +522,16 @@ def main():
         print(book)
 
     # Sauvegarde des données dans différents formats dans le dossier 'output'
-    save_data_csv(books)
-    save_data_json(books)
-    save_data_excel(books)
+    # (les trois écritures sont indépendantes et se recouvrent)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        csv_future = executor.submit(save_data_csv, books)
+        executor.submit(save_data_json, books)
+        executor.submit(save_data_excel, books)
 
-    # Insertion des données dans la base de données MySQL
-    insert_data_mysql(books)
+    # Insertion des données dans la base de données MySQL (chargement en masse depuis le CSV écrit)
+    csv_path = csv_future.result()
+    insert_data_mysql(books, csv_path=csv_path)
+    return csv_path is not None
 
 if __name__ == "__main__":
     main()
\ No newline at end of file